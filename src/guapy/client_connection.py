@@ -3,6 +3,7 @@
 import asyncio
 import contextlib
 import logging
+import time
 from typing import Optional
 
 from fastapi import WebSocket
@@ -45,7 +46,7 @@ class ClientConnection:
         self.logger = logging.getLogger(__name__)
 
         self.state = self.STATE_OPEN  # Start in open state
-        self.last_activity = asyncio.get_event_loop().time()
+        self.last_activity = time.monotonic()
         self.guacd_client: Optional[GuacdClient] = None
         self.connection_config: Optional[ConnectionConfig] = None
 
@@ -182,7 +183,7 @@ class ClientConnection:
         if self.state == self.STATE_OPEN:
             try:
                 await self.websocket.send_text(message)
-                self.last_activity = asyncio.get_event_loop().time()
+                self.last_activity = time.monotonic()
             except Exception as e:
                 self.logger.error(
                     f"Failed to send message: {e}",
@@ -233,7 +234,7 @@ class ClientConnection:
                         f"Received WebSocket message: {message}",
                         extra={"connection_id": self.connection_id},
                     )
-                    self.last_activity = asyncio.get_event_loop().time()
+                    self.last_activity = time.monotonic()
 
                     if (
                         self.guacd_client
@@ -4,294 +4,433 @@ This module defines a comprehensive exception hierarchy for Guapy, providing
 clear error handling and debugging capabilities for WebSocket proxy operations.
 """
 
-from typing import Any, Optional
+import copy
+import types
+from collections.abc import Mapping
+from typing import Any, Optional, Union
+
+# Shared read-only mapping used when an exception carries no details.
+# Avoids allocating a fresh empty dict per instance on error-heavy paths.
+_EMPTY_DETAILS: Any = types.MappingProxyType({})
+
+
+def _frameless_copy(exc: Exception) -> Exception:
+    """Returns a shallow copy of ``exc`` with its traceback dropped.
+
+    Retaining the copy avoids pinning the original frame chain without
+    touching the caller's live exception, so ``raise ... from`` output
+    keeps its frames.
+    """
+    clone = copy.copy(exc)
+    clone.__traceback__ = None
+    return clone
 
 
 class GuapyError(Exception):
     """Base exception class for all Guapy-related errors."""
 
+    # error_code lives on the class: subclasses override it with their fixed
+    # code, so no per-instance assignment (or slot) is needed unless a caller
+    # explicitly passes a different one.
+    error_code: Optional[str] = None
+
+    # Slots for the fixed attributes. Instances still carry a __dict__
+    # (BaseException provides one; per-instance error_code overrides land
+    # there), so the win is faster attribute access, not a dict-free layout.
+    __slots__ = ("_repr_cache", "cause", "details", "message")
+
     def __init__(
         self,
         message: str,
+        *,
         error_code: Optional[str] = None,
-        details: Optional[dict[str, Any]] = None,
+        details: Optional[Mapping[str, Any]] = None,
         cause: Optional[Exception] = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(message)
         self.message = message
-        self.error_code = error_code
-        self.details = details or {}
-        # Add any additional keyword arguments to details
-        self.details.update(kwargs)
+        if error_code is not None:
+            self.error_code = error_code
+        # Build the details mapping lazily: only allocate when at least one
+        # field was supplied, otherwise share the module-level empty mapping.
+        if details:
+            self.details = {**details, **kwargs} if kwargs else details
+        elif kwargs:
+            self.details = kwargs
+        else:
+            self.details = _EMPTY_DETAILS
         self.cause = cause
+        self._repr_cache: Optional[str] = None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # BaseException's default pickling only carries __dict__, which
+        # misses the slotted attributes, so they are bundled explicitly.
+        state = {
+            "message": self.message,
+            "error_code": self.error_code,
+            "details": dict(self.details),
+            "cause": self.cause,
+        }
+        return (self.__class__, (self.message,), state)
+
+    def __setstate__(self, state: Optional[dict[str, Any]]) -> None:
+        if not state:
+            return
+        self.message = state["message"]
+        self.error_code = state["error_code"]
+        details = state["details"]
+        self.details = details if details else _EMPTY_DETAILS
+        self.cause = state["cause"]
+
+    def lean_copy(self) -> "GuapyError":
+        """Returns a shallow copy with traceback, context and cause cleared.
+
+        Intended for exceptions retained past their raise site (structured
+        error reporting, caches): the copy no longer references frames, so
+        the original call stack can be garbage collected.
+        """
+        clone = copy.copy(self)
+        clone.__traceback__ = None
+        clone.__context__ = None
+        clone.__cause__ = None
+        if clone.cause is not None:
+            # A retained cause would otherwise keep its whole traceback and
+            # frame chain alive for as long as the copy is stored.
+            clone.cause = _frameless_copy(clone.cause)
+        return clone
 
     def __str__(self) -> str:
-        error_str = self.message
+        # Assemble the pieces once and join, instead of reassigning through
+        # a chain of intermediate f-strings.
+        parts = []
         if self.error_code:
-            error_str = f"[{self.error_code}] {error_str}"
-        if self.details:
-            details_str = ", ".join(f"{k}={v}" for k, v in self.details.items())
-            error_str = f"{error_str} (details: {details_str})"
-        return error_str
+            parts.append(f"[{self.error_code}] ")
+        parts.append(self.message)
+        details = self._details_for_display()
+        if details:
+            # An explicit list lets join skip the generator materialization step
+            details_str = ", ".join([f"{k}={v}" for k, v in details.items()])
+            parts.append(f" (details: {details_str})")
+        return "".join(parts)
+
+    def _details_for_display(self) -> Any:
+        """Hook for subclasses to adjust how details are rendered in __str__."""
+        return self.details
+
+    def __repr__(self) -> str:
+        # Fields are effectively immutable after __init__, so the first
+        # computed representation is reused by repeated logging/rendering.
+        cached = self._repr_cache
+        if cached is None:
+            cached = (
+                f"{type(self).__name__}({self.message!r}, "
+                f"error_code={self.error_code!r})"
+            )
+            self._repr_cache = cached
+        return cached
 
 
 # Configuration Errors
 class GuapyConfigurationError(GuapyError):
     """Raised when configuration is invalid or missing."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CONFIGURATION_ERROR")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CONFIGURATION_ERROR"
 
 
 # Connection Errors
 class GuapyConnectionError(GuapyError):
     """Base exception for connection-related errors."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CONNECTION_ERROR")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CONNECTION_ERROR"
 
 
 class GuapyTimeoutError(GuapyConnectionError):
     """Raised when an operation times out."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "TIMEOUT_ERROR")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "TIMEOUT_ERROR"
 
 
 class GuacdConnectionError(GuapyConnectionError):
     """Raised when the initial connection to the guacd daemon fails."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "GUACD_CONNECTION_FAILED")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "GUACD_CONNECTION_FAILED"
 
 
 class WebSocketConnectionError(GuapyConnectionError):
     """Raised for WebSocket-specific connection issues."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "WEBSOCKET_ERROR")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "WEBSOCKET_ERROR"
 
 
 # Protocol Errors
 class GuapyProtocolError(GuapyError):
     """Base exception for Guacamole protocol errors."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "PROTOCOL_ERROR")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "PROTOCOL_ERROR"
+
+
+# How much of a malformed buffer to include when rendering a parsing error
+_RAW_DATA_PREVIEW = 100
 
 
 class ProtocolParsingError(GuapyProtocolError):
     """Raised when a Guacamole protocol instruction is malformed."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "PROTOCOL_PARSE_ERROR")
+    __slots__ = ()
+
+    error_code = "PROTOCOL_PARSE_ERROR"
+
+    def __init__(
+        self,
+        message: str,
+        raw_data: Optional[Union[str, bytes]] = None,
+        **kwargs: Any,
+    ) -> None:
+        if raw_data is not None:
+            # Store the reference untouched; truncating a potentially large
+            # buffer is deferred to display time.
+            kwargs["raw_data"] = raw_data
         super().__init__(message, **kwargs)
 
+    def _details_for_display(self) -> Any:
+        details = self.details
+        raw_data = details.get("raw_data")
+        if raw_data is not None and len(raw_data) > _RAW_DATA_PREVIEW:
+            details = {**details, "raw_data": raw_data[:_RAW_DATA_PREVIEW]}
+        return details
+
 
 class HandshakeError(GuapyProtocolError):
     """Raised when the Guacamole protocol handshake fails due to an unexpected sequence."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "HANDSHAKE_FAILED")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "HANDSHAKE_FAILED"
 
 
 # Authentication and Security Errors
+
+# Keys that must never leak into authentication error details.
+_AUTH_SENSITIVE = frozenset(("password", "token", "secret"))
+
+
 class GuapyAuthenticationError(GuapyError):
     """Base for authentication or authorization failures."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "AUTHENTICATION_FAILED")
+    __slots__ = ()
+
+    error_code = "AUTHENTICATION_FAILED"
+
+    def __init__(
+        self,
+        message: str,
+        user_info: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        if user_info:
+            # Only rebuild the dict when a sensitive key is actually present;
+            # the common case (e.g. just a username) passes through as-is.
+            if not _AUTH_SENSITIVE.isdisjoint(user_info):
+                user_info = {
+                    k: v for k, v in user_info.items() if k not in _AUTH_SENSITIVE
+                }
+            kwargs["user_info"] = user_info
         super().__init__(message, **kwargs)
 
 
 class GuapyCryptoError(GuapyAuthenticationError):
     """Base for cryptographic operation failures."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CRYPTO_ERROR")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CRYPTO_ERROR"
 
 
 class TokenDecryptionError(GuapyCryptoError):
     """Raised when token decryption fails."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "TOKEN_DECRYPT_FAILED")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "TOKEN_DECRYPT_FAILED"
 
 
 class TokenEncryptionError(GuapyCryptoError):
     """Raised when token encryption fails."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "TOKEN_ENCRYPT_FAILED")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "TOKEN_ENCRYPT_FAILED"
 
 
 # Specific guacd Status Exceptions
 class GuapyUnsupportedError(GuapyProtocolError):
     """The requested operation is unsupported (Status: 0x0100)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "UNSUPPORTED")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "UNSUPPORTED"
 
 
 class GuapyServerBusyError(GuapyConnectionError):
     """The operation could not be performed as the server is busy (Status: 0x0201)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "SERVER_BUSY")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "SERVER_BUSY"
 
 
 class GuapyUpstreamTimeoutError(GuapyConnectionError):
     """The upstream server is not responding (Status: 0x0202)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "UPSTREAM_TIMEOUT")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "UPSTREAM_TIMEOUT"
 
 
 class GuapyUpstreamError(GuapyConnectionError):
     """The upstream server returned an error (Status: 0x0203)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "UPSTREAM_ERROR")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "UPSTREAM_ERROR"
 
 
 class GuapyResourceNotFoundError(GuapyProtocolError):
     """The requested resource does not exist (Status: 0x0204)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "RESOURCE_NOT_FOUND")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "RESOURCE_NOT_FOUND"
 
 
 class GuapyResourceConflictError(GuapyProtocolError):
     """The requested resource is already in use (Status: 0x0205)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "RESOURCE_CONFLICT")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "RESOURCE_CONFLICT"
 
 
 class GuapySessionConflictError(GuapyConnectionError):
     """The session conflicted with another session (Status: 0x0209)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "SESSION_CONFLICT")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "SESSION_CONFLICT"
 
 
 class GuapySessionTimeoutError(GuapyConnectionError):
     """The session appeared to be inactive (Status: 0x020A)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "SESSION_TIMEOUT")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "SESSION_TIMEOUT"
 
 
 class GuapySessionClosedError(GuapyConnectionError):
     """The session was forcibly terminated (Status: 0x020B)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "SESSION_CLOSED")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "SESSION_CLOSED"
 
 
 class GuapyClientBadRequestError(GuapyProtocolError):
     """The operation could not be performed due to bad parameters (Status: 0x0300)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CLIENT_BAD_REQUEST")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CLIENT_BAD_REQUEST"
 
 
 class GuapyUnauthorizedError(GuapyAuthenticationError):
     """Permission was denied to perform the operation (Status: 0x0301)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CLIENT_UNAUTHORIZED")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CLIENT_UNAUTHORIZED"
 
 
 class GuapyForbiddenError(GuapyAuthenticationError):
     """The operation is forbidden (Status: 0x0303)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CLIENT_FORBIDDEN")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CLIENT_FORBIDDEN"
 
 
 class GuapyClientTooManyError(GuapyProtocolError):
     """The client is already using too many resources (Status: 0x031D)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CLIENT_TOO_MANY")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CLIENT_TOO_MANY"
 
 
 class GuapyServerError(GuapyConnectionError):
     """Generic server error for internal failures (Status: 0x0200)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "SERVER_ERROR")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "SERVER_ERROR"
 
 
 class GuapyResourceClosedError(GuapyConnectionError):
     """A resource or stream has been closed (Status: 0x0206)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "RESOURCE_CLOSED")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "RESOURCE_CLOSED"
 
 
 class GuapyUpstreamNotFoundError(GuapyConnectionError):
     """The upstream host cannot be reached or resolved (Status: 0x0207)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "UPSTREAM_NOT_FOUND")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "UPSTREAM_NOT_FOUND"
 
 
 class GuapyUpstreamUnavailableError(GuapyConnectionError):
     """The upstream is refusing or unavailable to service connections (Status: 0x0208)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "UPSTREAM_UNAVAILABLE")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "UPSTREAM_UNAVAILABLE"
 
 
 class GuapyClientTimeoutError(GuapyConnectionError):
     """Client timed out or gave no response (Status: 0x0308)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CLIENT_TIMEOUT")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CLIENT_TIMEOUT"
 
 
 class GuapyClientOverrunError(GuapyProtocolError):
     """Client sent excessive data (Status: 0x030D)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CLIENT_OVERRUN")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CLIENT_OVERRUN"
 
 
 class GuapyClientBadTypeError(GuapyProtocolError):
     """Client sent unsupported or unexpected data type (Status: 0x030F)."""
 
-    def __init__(self, message: str, **kwargs: Any) -> None:
-        kwargs.setdefault("error_code", "CLIENT_BAD_TYPE")
-        super().__init__(message, **kwargs)
+    __slots__ = ()
+
+    error_code = "CLIENT_BAD_TYPE"
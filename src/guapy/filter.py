@@ -4,8 +4,9 @@ This allows for a clean separation of concerns for tasks like error handling,
 session recording, or analytics.
 """
 
-from abc import ABC, abstractmethod
-from typing import Optional
+import types
+from collections.abc import Mapping
+from typing import Any, NamedTuple, Optional, Protocol, Union
 
 from .exceptions import (
     GuapyClientBadRequestError,
@@ -13,6 +14,7 @@ from .exceptions import (
     GuapyClientOverrunError,
     GuapyClientTimeoutError,
     GuapyClientTooManyError,
+    GuapyError,
     GuapyForbiddenError,
     GuapyProtocolError,
     GuapyResourceClosedError,
@@ -33,7 +35,7 @@ from .exceptions import (
 
 # It maps the numeric status codes from guacd to our specific exception classes.
 # Based on Guacamole's canonical status enumeration used by guacd.
-GUACD_ERROR_MAP = {
+_GUACD_ERROR_CODES = {
     # Note: 0x0000 SUCCESS is intentionally omitted - it should not raise an exception
     # Unsupported operations
     0x0100: GuapyUnsupportedError,
@@ -60,14 +62,87 @@ GUACD_ERROR_MAP = {
     0x031D: GuapyClientTooManyError,
 }
 
+# Read-only public view of the status code mapping, kept for backward compat.
+GUACD_ERROR_MAP = types.MappingProxyType(_GUACD_ERROR_CODES)
+
+# Dense lookup table indexed directly by status code. Status codes are small
+# bounded ints (0x0100-0x031D), so list indexing replaces dict hashing with a
+# C-level item fetch on the error path. Unknown codes fall back to
+# GuapyProtocolError. A match/case jump table would be an alternative on
+# Python 3.10+, but this package still supports 3.9 and the indexed fetch is
+# at least as fast.
+_ERROR_TABLE: list[type[GuapyError]] = [GuapyProtocolError] * 0x0400
+for _code, _exc_cls in _GUACD_ERROR_CODES.items():
+    _ERROR_TABLE[_code] = _exc_cls
+del _code, _exc_cls
+
+# guacd sends status codes as a small fixed set of decimal strings ("256",
+# "513", ...). A precomputed string->int dict avoids the generic int parser
+# for the common case; unknown strings still fall back to int().
+_STATUS_STR_TO_INT = {str(code): code for code in _GUACD_ERROR_CODES}
+_STATUS_STR_TO_INT["0"] = 0
+
+# Flyweight details mappings for the known status codes. The exception
+# details for a guacd error always hold exactly this one key, so share one
+# mapping per code instead of allocating a fresh single-entry dict per
+# raised error. The proxies are read-only, so a caller mutating one
+# exception's details cannot contaminate every later error for that code.
+_DETAILS_BY_CODE = {
+    code: types.MappingProxyType({"guacd_status_code": code})
+    for code in _GUACD_ERROR_CODES
+}
+
+
+def _parse_status_code(raw_status: str) -> int:
+    """Parses a guacd status field in one step.
 
-class GuacamoleFilter(ABC):
-    """An abstract base class for filtering Guacamole instructions,
+    The known decimal strings hit the precomputed dict; anything else goes
+    through int() once, and malformed values degrade to 0 (SUCCESS) so a
+    corrupt status field cannot blow up the filter itself.
+    """
+    code = _STATUS_STR_TO_INT.get(raw_status)
+    if code is not None:
+        return code
+    try:
+        return int(raw_status)
+    except ValueError:
+        return 0
+
+
+class ErrorSignal(NamedTuple):
+    """Sentinel describing a guacd 'error' instruction detected by ErrorFilter.
+
+    Instead of raising inside the per-instruction hot path (which would pay
+    for traceback construction and stack unwinding on every error frame),
+    ErrorFilter returns one of these and the caller raises ``exc_cls`` exactly
+    once at the session boundary, or uses it to close the connection directly.
+    """
+
+    exc_cls: type[GuapyError]
+    message: str
+    status_code: int
+
+    def to_exception(self) -> GuapyError:
+        """Builds the exception for this signal.
+
+        Known status codes reuse the shared read-only details mapping; the
+        exception itself is constructed directly.
+        """
+        details: Optional[Mapping[str, Any]] = _DETAILS_BY_CODE.get(self.status_code)
+        if details is None:
+            details = {"guacd_status_code": self.status_code}
+        return self.exc_cls(f"guacd error: {self.message}", details=details)
+
+
+class GuacamoleFilter(Protocol):
+    """A structural protocol for filtering Guacamole instructions,
     mirroring the GuacamoleFilter.java interface.
+
+    A Protocol carries no ABCMeta machinery, so concrete filters pay no
+    metaclass overhead on the per-instruction dispatch path.
     """
 
-    @abstractmethod
-    def filter(self, instruction: list[str]) -> Optional[list[str]]:
+    def filter(self, instruction: list[str]) -> Optional[Union[list[str], ErrorSignal]]:
         """Applies a filter to the given instruction.
 
         Args:
@@ -75,6 +150,8 @@ class GuacamoleFilter(ABC):
 
         Returns:
             - The original or a modified instruction if it's allowed to pass.
+            - An ErrorSignal if the instruction maps to an error the caller
+              should raise or act on at the session boundary.
             - `None` if the instruction should be silently dropped.
 
         Raises:
@@ -82,38 +159,44 @@ class GuacamoleFilter(ABC):
                         connection terminated. The specific exception raised
                         determines the nature of the error.
         """
-        pass
+        ...
 
 
 class ErrorFilter(GuacamoleFilter):
-    """A specific filter that checks for 'error' instructions from guacd
-    and raises the appropriate specific exception based on the status code.
+    """A specific filter that maps 'error' instructions from guacd
+    to an ErrorSignal carrying the matching exception class.
+
+    Registered under the "error" opcode only, so the dispatcher never
+    invokes it for other instructions and no opcode precheck is needed.
     """
 
-    def filter(self, instruction: list[str]) -> Optional[list[str]]:
-        """Checks for the 'error' opcode and raises a mapped exception.
-        Lets all other instructions pass through untouched.
+    #: Opcode this filter registers for in the dispatch table.
+    opcode = "error"
+
+    def filter(self, instruction: list[str]) -> Optional[Union[list[str], ErrorSignal]]:
+        """Returns a mapped ErrorSignal for the given 'error' instruction.
 
         Special handling:
         - 0x0000 SUCCESS: treated as non-error, passes through
         - Unknown status codes > 0x00FF: treated as errors (defensive handling)
         """
-        if not instruction or instruction[0] != "error":
-            return instruction  # Not an error, pass through
-
-        error_msg = instruction[1] if len(instruction) > 1 else "Unknown guacd error"
-        status_code = int(instruction[2]) if len(instruction) > 2 else 0
+        # Compute the length once instead of re-checking per field access
+        n = len(instruction)
+        error_msg = instruction[1] if n > 1 else "Unknown guacd error"
+        status_code = _parse_status_code(instruction[2]) if n > 2 else 0
 
-        # Handle SUCCESS status (0x0000) - should not raise an exception
+        # Handle SUCCESS status (0x0000) - should not signal an error
         if status_code == 0x0000:
             return instruction  # SUCCESS status, pass through as non-error
 
-        # Look up the specific exception from our map.
+        # Look up the specific exception from the dense table.
         # Fall back to a generic GuapyProtocolError if the code is unknown.
         # Defensive handling: treat any status code > 0x00FF as an error by default
-        exception_class = GUACD_ERROR_MAP.get(status_code, GuapyProtocolError)
-
-        # Raise the specific exception to terminate the connection
-        raise exception_class(
-            f"guacd error: {error_msg}", details={"guacd_status_code": status_code}
+        exception_class = (
+            _ERROR_TABLE[status_code]
+            if 0 <= status_code < 0x0400
+            else GuapyProtocolError
         )
+
+        # Return the signal; the caller raises it once at the session boundary
+        return ErrorSignal(exception_class, error_msg, status_code)
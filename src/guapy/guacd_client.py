@@ -1,14 +1,26 @@
 """Guacamole protocol handling and guacd client implementation."""
 
 import asyncio
+import codecs
 import logging
-from typing import TYPE_CHECKING, Optional
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Optional
 
 if TYPE_CHECKING:
     from .client_connection import ClientConnection
 
 from .exceptions import GuacdConnectionError, HandshakeError, ProtocolParsingError
-from .filter import ErrorFilter, GuacamoleFilter
+from .filter import ErrorFilter, ErrorSignal, GuacamoleFilter
+
+# Shared module logger, resolved once at import; getLogger takes the logging
+# module's lock and registry lookup on every call.
+_logger = logging.getLogger(__name__)
+
+# Precomputed b"<len>." prefixes. Opcodes and most values are short, so the
+# table lookup skips the generic int formatter and encode for nearly every
+# part; only unusually large payloads fall back to formatting the length.
+_LEN_PREFIX = [f"{i}.".encode("ascii") for i in range(4096)]
 
 
 class GuacamoleProtocol:
@@ -18,26 +30,66 @@ class GuacamoleProtocol:
     """
 
     @staticmethod
-    def format_instruction(parts: list[str]) -> str:
-        """Formats instruction parts into the Guacamole protocol string format."""
-        formatted_parts = []
+    def _format_fragments(parts: list[Any]) -> list[bytes]:
+        """Formats instruction parts into wire-order byte fragments.
+
+        Parts are usually str but callers also pass ints and None; anything
+        else is coerced with str().
+
+        The fragments concatenate to one complete instruction; writers can
+        hand them to StreamWriter.writelines without joining first, which
+        lets the transport gather them in a single step.
+        """
+        fragments = []
         for part in parts:
-            part_str = str(part if part is not None else "")
-            # The protocol counts Unicode code points, not bytes or UTF-16 characters.
-            formatted_parts.append(f"{len(part_str)}.{part_str}")
-        return ",".join(formatted_parts) + ";"
+            # Exact type check: callers almost always pass str already, so
+            # the common case skips the generic str() coercion entirely.
+            if type(part) is str:
+                part_str = part
+            elif part is None:
+                part_str = ""
+            else:
+                part_str = str(part)
+            # The protocol counts Unicode code points, not bytes or UTF-16
+            # characters, so the length is taken before UTF-8 encoding.
+            length = len(part_str)
+            fragments.append(
+                _LEN_PREFIX[length] if length < 4096 else f"{length}.".encode("ascii")
+            )
+            fragments.append(part_str.encode())
+            fragments.append(b",")
+        if not fragments:
+            return [b";"]
+        fragments[-1] = b";"
+        return fragments
+
+    @staticmethod
+    def format_instruction(parts: list[Any]) -> bytes:
+        """Formats instruction parts into the wire-ready Guacamole byte format."""
+        return b"".join(GuacamoleProtocol._format_fragments(parts))
 
     @staticmethod
-    def _find_instruction_end(buffer: str) -> int:
-        """Finds the end of the first complete Guacamole instruction in the buffer
-        by correctly parsing each element's length prefix.
+    def _peek_opcode(instruction: str) -> str:
+        """Reads the opcode of a complete instruction without a full parse.
+
+        Instructions always begin ``<N>.<opcode>``, so the opcode is the
+        ``N`` characters after the first dot.
+        """
+        dot = instruction.index(".")
+        length = int(instruction[:dot])
+        return instruction[dot + 1 : dot + 1 + length]
+
+    @staticmethod
+    def _find_instruction_end(buffer: str, start: int = 0) -> int:
+        """Finds the end of the first complete Guacamole instruction at or
+        after ``start`` by correctly parsing each element's length prefix.
 
         Returns the index of the terminating semicolon, or -1 if a complete
         instruction is not yet in the buffer.
 
         Raises ProtocolParsingError on malformed data.
         """
-        idx = 0
+        idx = start
         while idx < len(buffer):
             # Find the end of the length prefix for the current element
             length_end = buffer.find(".", idx)
@@ -96,17 +148,40 @@ class GuacamoleProtocol:
 
         parts = []
         idx = 0
-        while idx < len(instruction):
-            length_end = instruction.find(".", idx)
+        n = len(instruction)
+        while idx < n:
+            # index() scans at C level; a missing '.' on a complete
+            # instruction is malformed and surfaces as ValueError.
+            length_end = instruction.index(".", idx)
             length = int(instruction[idx:length_end])
             content_start = length_end + 1
             content_end = content_start + length
             parts.append(instruction[content_start:content_end])
             idx = content_end + 1  # Move past the comma to the next element's start
 
+        if parts:
+            # Intern the opcode so downstream comparisons (e.g. ErrorFilter)
+            # reduce to pointer equality for the handful of protocol opcodes.
+            parts[0] = sys.intern(parts[0])
         return parts
 
 
+# Module-level bindings of the protocol staticmethods. The per-instruction
+# paths below go through these to skip the class attribute lookup per call.
+_format_fragments = GuacamoleProtocol._format_fragments
+_format_instruction = GuacamoleProtocol.format_instruction
+_parse_instruction = GuacamoleProtocol.parse_instruction
+_find_instruction_end = GuacamoleProtocol._find_instruction_end
+_peek_opcode = GuacamoleProtocol._peek_opcode
+
+# guacd advertises parameter names with '-', settings attributes use '_'.
+_DASH_TO_UNDER = str.maketrans("-", "_")
+
+# The parameter list guacd sends in 'args' is fixed per protocol/version,
+# so the resolved attribute names are cached across connections.
+_param_attr_cache: dict[tuple[str, tuple[str, ...]], list[str]] = {}
+
+
 class GuacdClient:
     """Manages TCP connection to guacd daemon with proper protocol handling."""
 
@@ -114,28 +189,46 @@ class GuacdClient:
     STATE_OPEN = 1
     STATE_CLOSED = 2
 
+    # Bytes pulled from the stream per read. A larger read drains bursty
+    # guacd output (image streams) in far fewer wakeups, amortizing the
+    # per-read bytes allocation the 4 KiB reads paid thousands of times.
+    RECEIVE_BUFFER_SIZE = 65536
+
     def __init__(self, client_connection: "ClientConnection") -> None:
         """Initialize guacd client."""
         self.client_connection = client_connection
-        self.logger = logging.getLogger(__name__)
-        self.filters: list[GuacamoleFilter] = [ErrorFilter()]
+        self.logger = _logger
+        # Snapshot the debug-enabled check once; isEnabledFor walks the
+        # logger hierarchy and is too costly to repeat per received chunk.
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
+        # Filters are keyed by the opcode they care about, so the dispatch
+        # loop pays no call overhead for the 99% of instructions no filter
+        # wants to see.
+        error_filter = ErrorFilter()
+        self.filters_by_opcode: dict[str, list[GuacamoleFilter]] = {
+            error_filter.opcode: [error_filter]
+        }
         self.state = self.STATE_OPENING
         self.writer: Optional[asyncio.StreamWriter] = None
         self.reader: Optional[asyncio.StreamReader] = None
         self._buffer = ""
-        self.last_activity = asyncio.get_event_loop().time()
+        # Incremental decoder so each received byte is transcoded exactly
+        # once, even when a multi-byte UTF-8 sequence is split across reads
+        # (a plain per-chunk decode would mangle the split character).
+        self._decode = codecs.getincrementaldecoder("utf-8")("replace").decode
+        self.last_activity = time.monotonic()
         self.logger.debug("GuacdClient initialized")
 
     async def connect(self, host: str, port: int) -> None:
         """Establish TCP connection to guacd."""
         try:
-            self.logger.debug(f"Connecting to guacd at {host}:{port}")
+            self.logger.debug("Connecting to guacd at %s:%s", host, port)
             self.reader, self.writer = await asyncio.open_connection(host, port)
             self.logger.debug("TCP connection established")
             self.state = self.STATE_OPENING
             await self._start_handshake()
         except Exception as e:
-            self.logger.error(f"Failed to connect to guacd: {e}")
+            self.logger.error("Failed to connect to guacd: %s", e)
             raise GuacdConnectionError(
                 f"Failed to connect to guacd: {e}",
                 guacd_host=host,
@@ -160,26 +253,55 @@ class GuacdClient:
                 )
 
             settings = self.client_connection.connection_config.settings
-            await self.send_instruction(
-                ["size", str(settings.width), str(settings.height), str(settings.dpi)]
-            )
-            await self.send_instruction(["audio", "audio/L16"])
-            await self.send_instruction(["video"])
-            await self.send_instruction(["image", "image/png", "image/jpeg"])
 
             version = instruction[1]
             param_names = instruction[2:]
-            params = ["connect", version]
-            for name in param_names:
-                attr = name.replace("-", "_")
+            cache_key = (protocol, tuple(param_names))
+            attr_names = _param_attr_cache.get(cache_key)
+            if attr_names is None:
+                attr_names = [name.translate(_DASH_TO_UNDER) for name in param_names]
+                _param_attr_cache[cache_key] = attr_names
+            if self._debug:
+                # Log only the advertised names: the resolved values may
+                # carry credentials, and for RDP the list is 50+ entries
+                # that would otherwise be formatted even when discarded.
+                self.logger.debug(
+                    "guacd requested %d connect parameters: %s",
+                    len(param_names),
+                    param_names,
+                )
+            # Preallocate and fill by index: RDP advertises 50+ parameters,
+            # so this skips the append-driven list resizes. True/False/None
+            # are singletons, so identity tests replace the isinstance check.
+            params = [""] * (2 + len(attr_names))
+            params[0] = "connect"
+            params[1] = version
+            for i, attr in enumerate(attr_names, start=2):
                 value = getattr(settings, attr, "")
-                if isinstance(value, bool):
-                    value = "true" if value else "false"
-                if value is None:
-                    value = ""
-                params.append(str(value))
-
-            await self.send_instruction(params)
+                if value is True:
+                    params[i] = "true"
+                elif value is False:
+                    params[i] = "false"
+                elif value is not None:
+                    params[i] = str(value)
+
+            # Everything after 'args' can go out in a single write/drain:
+            # guacd does not respond until the full sequence has arrived,
+            # so per-instruction drains only add event-loop round-trips.
+            await self.send_instructions(
+                [
+                    [
+                        "size",
+                        str(settings.width),
+                        str(settings.height),
+                        str(settings.dpi),
+                    ],
+                    ["audio", "audio/L16"],
+                    ["video"],
+                    ["image", "image/png", "image/jpeg"],
+                    params,
+                ]
+            )
 
             ready_instruction = await self._receive_instruction()
             if not ready_instruction:
@@ -188,7 +310,7 @@ class GuacdClient:
                     handshake_phase="ready",
                 )
 
-            self.filters[0].filter(ready_instruction)
+            self._apply_filters(ready_instruction)
 
             if ready_instruction[0] != "ready":
                 raise HandshakeError(
@@ -201,34 +323,50 @@ class GuacdClient:
             self.logger.info("Guacd handshake completed successfully.")
         except (ProtocolParsingError, HandshakeError) as e:
             self.state = self.STATE_CLOSED
-            self.logger.error(f"Handshake failed due to protocol error: {e}")
+            self.logger.error("Handshake failed due to protocol error: %s", e)
             raise
         except Exception as e:
             self.state = self.STATE_CLOSED
-            self.logger.error(f"An unexpected error occurred during handshake: {e}")
+            self.logger.error("An unexpected error occurred during handshake: %s", e)
             raise GuacdConnectionError("Unexpected handshake failure") from e
 
     async def send_instruction(self, instruction_parts: list[str]) -> None:
-        """Sends the instructions to format and then to guacd using send_raw_message"""
-        instruction = GuacamoleProtocol.format_instruction(instruction_parts)
-        await self.send_raw_message(instruction)
+        """Formats the instruction and writes the resulting bytes to guacd."""
+        if not self.writer:
+            raise ConnectionError("Not connected to guacd")
+        # writelines feeds the fragments to the transport in one scheduling
+        # step, skipping the join that format_instruction would do.
+        self.writer.writelines(_format_fragments(instruction_parts))
+        await self.writer.drain()
+        self.last_activity = time.monotonic()
+
+    async def send_instructions(self, instructions: list[list[str]]) -> None:
+        """Formats several instructions and sends them with one write/drain."""
+        if not self.writer:
+            raise ConnectionError("Not connected to guacd")
+        fragments: list[bytes] = []
+        for parts in instructions:
+            fragments += _format_fragments(parts)
+        self.writer.writelines(fragments)
+        await self.writer.drain()
+        self.last_activity = time.monotonic()
 
     async def send_raw_message(self, message: str) -> None:
         if not self.writer:
             raise ConnectionError("Not connected to guacd")
         self.writer.write(message.encode())
         await self.writer.drain()
-        self.last_activity = asyncio.get_event_loop().time()
+        self.last_activity = time.monotonic()
 
     async def _receive_instruction(self) -> Optional[list[str]]:
         """Read from the socket until a complete instruction is buffered, then parse it."""
         while True:
             try:
-                instruction_end = GuacamoleProtocol._find_instruction_end(self._buffer)
+                instruction_end = _find_instruction_end(self._buffer)
                 if instruction_end != -1:
                     instruction_str = self._buffer[: instruction_end + 1]
                     self._buffer = self._buffer[instruction_end + 1 :]
-                    return GuacamoleProtocol.parse_instruction(instruction_str)
+                    return _parse_instruction(instruction_str)
             except ProtocolParsingError:
                 self.logger.error("Protocol parsing error, closing connection.")
                 await self.close()
@@ -236,20 +374,41 @@ class GuacdClient:
 
             if not self.reader:
                 return None
-            chunk = await self.reader.read(4096)
+            try:
+                # readuntil lets asyncio's C-backed buffer do the delimiter
+                # scan and usually yields one whole instruction per call. A
+                # ';' may legally occur inside an element value, so
+                # completeness is still verified by _find_instruction_end.
+                chunk = await self.reader.readuntil(b";")
+            except asyncio.IncompleteReadError:
+                self.logger.info(
+                    "Guacd connection closed while waiting for instruction."
+                )
+                return None
+            except asyncio.LimitOverrunError:
+                # No separator within the stream limit; drain what is
+                # buffered and keep scanning.
+                chunk = await self.reader.read(self.RECEIVE_BUFFER_SIZE)
             if not chunk:
                 self.logger.info(
                     "Guacd connection closed while waiting for instruction."
                 )
                 return None
-            self._buffer += chunk.decode(errors="replace")
+            self._buffer += self._decode(chunk)
 
     def _apply_filters(self, instruction: list[str]) -> Optional[list[str]]:
+        if not instruction:
+            return instruction
         current_instruction: Optional[list[str]] = instruction
-        for f in self.filters:
+        for f in self.filters_by_opcode.get(instruction[0], ()):
             if current_instruction is None:
                 return None
-            current_instruction = f.filter(current_instruction)
+            result = f.filter(current_instruction)
+            if isinstance(result, ErrorSignal):
+                # Raise exactly once at the session boundary instead of
+                # inside the per-instruction filter hot path.
+                raise result.to_exception()
+            current_instruction = result
         return current_instruction
 
     async def start(self) -> None:
@@ -275,14 +434,19 @@ class GuacdClient:
                         )
                         break
 
-                    data = await self.reader.read(4096)
+                    data = await self.reader.read(self.RECEIVE_BUFFER_SIZE)
                     if not data:
                         self.logger.debug("guacd connection closed by remote host")
                         break
-                    self._buffer += data.decode(errors="replace")
-                    self.logger.debug(
-                        f"Received guacd data({len(data)} chars):{self._buffer[:120]}"
-                    )
+                    self._buffer += self._decode(data)
+                    if self._debug:
+                        # Guarded so the slice and formatting are skipped
+                        # entirely when debug logging is off.
+                        self.logger.debug(
+                            "Received guacd data(%d chars):%s",
+                            len(data),
+                            self._buffer[:120],
+                        )
                     await self._process_and_forward_buffer()
                 except asyncio.CancelledError:
                     self.logger.info("guacd message loop cancelled")
@@ -290,40 +454,69 @@ class GuacdClient:
         except asyncio.CancelledError:
             self.logger.info("guacd message loop cancelled (outer)")
         except Exception as e:
-            self.logger.debug(f"Error in guacd message loop: {e}")
+            self.logger.debug("Error in guacd message loop: %s", e)
         finally:
             self.logger.debug("guacd message loop ended")
             self.state = self.STATE_CLOSED
 
     async def _process_and_forward_buffer(self) -> None:
-        """Parse all complete instructions from buffer, filter them, and forward."""
-        while True:
-            try:
-                instruction_end = GuacamoleProtocol._find_instruction_end(self._buffer)
-                if instruction_end == -1:
-                    break  # No more complete instructions in buffer
-            except ProtocolParsingError:
-                self.logger.error(
-                    "Protocol parsing error in buffer, closing connection."
-                )
-                await self.close()
-                raise
+        """Parse all complete instructions from buffer, filter them, and forward.
 
-            instruction_str = self._buffer[: instruction_end + 1]
-            self._buffer = self._buffer[instruction_end + 1 :]
+        Instructions are consumed by advancing a position into the buffer;
+        the unread tail is copied once per received chunk instead of once per
+        instruction, keeping per-chunk cost linear during bursts of many
+        small instructions.
+        """
+        buffer = self._buffer
+        pos = 0
+        try:
+            while True:
+                try:
+                    instruction_end = _find_instruction_end(buffer, pos)
+                    if instruction_end == -1:
+                        break  # No more complete instructions in buffer
+                except ProtocolParsingError:
+                    self.logger.error(
+                        "Protocol parsing error in buffer, closing connection."
+                    )
+                    await self.close()
+                    raise
 
-            parsed = GuacamoleProtocol.parse_instruction(instruction_str)
-            filtered: Optional[list[str]] = self._apply_filters(parsed)
+                instruction_str = buffer[pos : instruction_end + 1]
+                pos = instruction_end + 1
 
-            if filtered:
-                final_instruction_str = GuacamoleProtocol.format_instruction(filtered)
-                if self.client_connection.state == self.client_connection.STATE_OPEN:
-                    await self.client_connection.send_message(final_instruction_str)
-                else:
+                # Fast path: when no filter registered for this opcode and it
+                # is not a sync (which needs its timestamp echoed back), the
+                # instruction is forwarded verbatim without parse/re-format.
+                opcode = _peek_opcode(instruction_str)
+                if opcode != "sync" and opcode not in self.filters_by_opcode:
+                    if (
+                        self.client_connection.state
+                        == self.client_connection.STATE_OPEN
+                    ):
+                        await self.client_connection.send_message(instruction_str)
+                        continue
                     break
 
-                if filtered[0] == "sync":
-                    await self.send_instruction(["sync", filtered[1]])
+                parsed = _parse_instruction(instruction_str)
+                filtered: Optional[list[str]] = self._apply_filters(parsed)
+
+                if filtered:
+                    final_instruction_str = _format_instruction(filtered).decode()
+                    if (
+                        self.client_connection.state
+                        == self.client_connection.STATE_OPEN
+                    ):
+                        await self.client_connection.send_message(final_instruction_str)
+                    else:
+                        break
+
+                    if filtered[0] == "sync":
+                        await self.send_instruction(["sync", filtered[1]])
+        finally:
+            # Drop everything consumed in this pass with a single tail copy
+            if pos:
+                self._buffer = buffer[pos:]
 
     async def close(self) -> None:
         if self.state != self.STATE_CLOSED:
@@ -333,6 +526,6 @@ class GuacdClient:
                     self.writer.close()
                     await self.writer.wait_closed()
                 except Exception as e:
-                    self.logger.debug(f"Error closing guacd writer: {e}")
+                    self.logger.debug("Error closing guacd writer: %s", e)
         self.writer = None
         self.reader = None
@@ -163,6 +163,22 @@ class TestSpecificExceptions:
         assert isinstance(auth_error, GuapyError)
         assert isinstance(auth_error, GuapyAuthenticationError)
 
+    def test_authentication_error_user_info_passthrough(self):
+        """Test that vetted user_info is stored without rebuilding."""
+        user_info = {"username": "alice"}
+        error = GuapyAuthenticationError("Auth failed", user_info=user_info)
+
+        assert error.details["user_info"] is user_info
+
+    def test_authentication_error_user_info_scrubbed(self):
+        """Test that sensitive user_info keys are filtered out."""
+        user_info = {"username": "alice", "password": "hunter2", "token": "abc"}
+        error = GuapyAuthenticationError("Auth failed", user_info=user_info)
+
+        assert error.details["user_info"] == {"username": "alice"}
+        # The original dict must not be mutated
+        assert "password" in user_info
+
     def test_timeout_exceptions(self):
         """Test timeout-related exceptions."""
         timeout_error = GuapyTimeoutError("Operation timed out")
@@ -260,6 +276,17 @@ class TestProtocolError:
         assert error.details["expected_format"] == "instruction;params"
         assert isinstance(error, GuapyProtocolError)
 
+    def test_protocol_parsing_error_truncates_raw_data_display(self):
+        """Test that large raw_data is kept whole but truncated for display."""
+        raw_data = "x" * 500
+        error = ProtocolParsingError("Invalid instruction", raw_data=raw_data)
+
+        # Full buffer is retained by reference, no copy at raise time
+        assert error.details["raw_data"] is raw_data
+        # Display only includes a bounded preview
+        assert "x" * 100 in str(error)
+        assert "x" * 101 not in str(error)
+
 
 class TestCryptoError:
     """Test GuapyCryptoError specific functionality."""
@@ -365,6 +392,35 @@ class TestExceptionUsage:
             wrapped = GuapyError("Wrapped error", cause=e)
             assert wrapped.cause == original
 
+    def test_cause_traceback_stripped(self):
+        """Test that lean_copy stores a frame-less copy of the cause."""
+        try:
+            raise ValueError("Original error")
+        except ValueError as e:
+            assert e.__traceback__ is not None
+            wrapped = GuapyError("Wrapped error", cause=e)
+            lean = wrapped.lean_copy()
+            # The live exception and the stored cause keep their frames,
+            # so `raise ... from` output is unaffected
+            assert e.__traceback__ is not None
+            assert wrapped.cause is e
+
+        assert lean.cause is not None
+        assert lean.cause.__traceback__ is None
+
+    def test_lean_copy_clears_frames(self):
+        """Test that lean_copy drops traceback, context and cause links."""
+        try:
+            raise GuapyError("Test error", error_code="TEST001")
+        except GuapyError as e:
+            lean = e.lean_copy()
+
+        assert lean.__traceback__ is None
+        assert lean.__context__ is None
+        assert lean.__cause__ is None
+        assert lean.message == "Test error"
+        assert lean.error_code == "TEST001"
+
     def test_exception_details_formatting(self):
         """Test that exception details are formatted correctly."""
         details = {
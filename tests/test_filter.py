@@ -25,7 +25,7 @@ from guapy.exceptions import (
     GuapyUpstreamTimeoutError,
     GuapyUpstreamUnavailableError,
 )
-from guapy.filter import GUACD_ERROR_MAP, ErrorFilter, GuacamoleFilter
+from guapy.filter import GUACD_ERROR_MAP, ErrorFilter, ErrorSignal, GuacamoleFilter
 
 
 class TestGuacamoleFilter:
@@ -45,40 +45,28 @@ class TestErrorFilter:
         """Create ErrorFilter instance."""
         return ErrorFilter()
 
-    def test_non_error_instruction_passes_through(self, error_filter):
-        """Test that non-error instructions pass through unchanged."""
-        instruction = ["ready", "connection_id"]
-        result = error_filter.filter(instruction)
-        assert result == instruction
-
-    def test_sync_instruction_passes_through(self, error_filter):
-        """Test that sync instructions pass through unchanged."""
-        instruction = ["sync", "123456"]
-        result = error_filter.filter(instruction)
-        assert result == instruction
-
-    def test_mouse_instruction_passes_through(self, error_filter):
-        """Test that mouse instructions pass through unchanged."""
-        instruction = ["mouse", "100", "200", "1"]
-        result = error_filter.filter(instruction)
-        assert result == instruction
+    def test_registers_for_error_opcode(self, error_filter):
+        """Test that ErrorFilter declares the 'error' opcode for dispatch."""
+        assert error_filter.opcode == "error"
 
     def test_error_instruction_with_known_status_code(self, error_filter):
-        """Test that error instructions with known status codes raise appropriate exceptions."""
+        """Test that error instructions with known status codes return the mapped signal."""
         # Test unauthorized error (0x0301 = 769)
-        with pytest.raises(GuapyUnauthorizedError) as exc_info:
-            error_filter.filter(["error", "Access denied", "769"])
+        result = error_filter.filter(["error", "Access denied", "769"])
 
-        assert "guacd error: Access denied" in str(exc_info.value)
-        assert exc_info.value.details["guacd_status_code"] == 769
+        assert isinstance(result, ErrorSignal)
+        assert result.exc_cls is GuapyUnauthorizedError
+        assert result.message == "Access denied"
+        assert result.status_code == 769
 
     def test_error_instruction_with_unknown_status_code(self, error_filter):
-        """Test that error instructions with unknown status codes raise generic protocol error."""
-        with pytest.raises(GuapyProtocolError) as exc_info:
-            error_filter.filter(["error", "Unknown error", "999"])
+        """Test that error instructions with unknown status codes signal a generic protocol error."""
+        result = error_filter.filter(["error", "Unknown error", "999"])
 
-        assert "guacd error: Unknown error" in str(exc_info.value)
-        assert exc_info.value.details["guacd_status_code"] == 999
+        assert isinstance(result, ErrorSignal)
+        assert result.exc_cls is GuapyProtocolError
+        assert result.message == "Unknown error"
+        assert result.status_code == 999
 
     def test_error_instruction_minimal_format(self, error_filter):
         """Test error instruction with minimal format (no message, no status code)."""
@@ -105,14 +93,42 @@ class TestErrorFilter:
         """Test that unknown status codes fall back to GuapyProtocolError."""
         # Test with a non-zero status code not in the map
         unknown_status = 0x9999
-        with pytest.raises(GuapyProtocolError) as exc_info:
-            error_filter.filter(["error", "Unknown error type", str(unknown_status)])
+        result = error_filter.filter(
+            ["error", "Unknown error type", str(unknown_status)]
+        )
+
+        assert isinstance(result, ErrorSignal)
+        assert result.exc_cls is GuapyProtocolError
+        assert result.message == "Unknown error type"
+        assert result.status_code == unknown_status
+
+    def test_error_instruction_malformed_status_code(self, error_filter):
+        """Test that a non-numeric status code is treated as SUCCESS."""
+        instruction = ["error", "Garbled", "not-a-number"]
+        result = error_filter.filter(instruction)
+        # Malformed status degrades to 0 rather than raising in the filter
+        assert result == instruction
+
+    def test_error_signal_to_exception(self, error_filter):
+        """Test that ErrorSignal.to_exception builds the mapped exception."""
+        result = error_filter.filter(["error", "Server busy", "513"])
 
-        assert "guacd error: Unknown error type" in str(exc_info.value)
-        assert exc_info.value.details["guacd_status_code"] == unknown_status
+        exc = result.to_exception()
+        assert isinstance(exc, GuapyServerBusyError)
+        assert exc.message == "guacd error: Server busy"
+        assert exc.details["guacd_status_code"] == 513
+
+    def test_error_signal_to_exception_unknown_code(self, error_filter):
+        """Test that to_exception falls back to full construction for unknown codes."""
+        result = error_filter.filter(["error", "Strange failure", "999"])
+
+        exc = result.to_exception()
+        assert isinstance(exc, GuapyProtocolError)
+        assert exc.message == "guacd error: Strange failure"
+        assert exc.details["guacd_status_code"] == 999
 
     def test_all_mapped_error_codes(self, error_filter):
-        """Test that all mapped error codes raise the correct exception types."""
+        """Test that all mapped error codes signal the correct exception types."""
         test_cases = [
             # Unsupported operations
             (0x0100, GuapyUnsupportedError),
@@ -140,13 +156,14 @@ class TestErrorFilter:
         ]
 
         for status_code, expected_exception in test_cases:
-            with pytest.raises(expected_exception) as exc_info:
-                error_filter.filter(
-                    ["error", f"Test error {status_code}", str(status_code)]
-                )
-
-            assert f"guacd error: Test error {status_code}" in str(exc_info.value)
-            assert exc_info.value.details["guacd_status_code"] == status_code
+            result = error_filter.filter(
+                ["error", f"Test error {status_code}", str(status_code)]
+            )
+
+            assert isinstance(result, ErrorSignal)
+            assert result.exc_cls is expected_exception
+            assert result.message == f"Test error {status_code}"
+            assert result.status_code == status_code
 
 
 class TestGuacdErrorMap:
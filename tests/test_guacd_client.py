@@ -15,17 +15,17 @@ class TestGuacamoleProtocol:
     def test_format_instruction_basic(self):
         """Test format_instruction with basic input."""
         result = GuacamoleProtocol.format_instruction(["select", "rdp"])
-        assert result == "6.select,3.rdp;"
+        assert result == b"6.select,3.rdp;"
 
     def test_format_instruction_with_none(self):
         """Test format_instruction with None values."""
         result = GuacamoleProtocol.format_instruction(["select", None, "rdp"])
-        assert result == "6.select,0.,3.rdp;"
+        assert result == b"6.select,0.,3.rdp;"
 
     def test_format_instruction_with_numbers(self):
         """Test format_instruction with numeric values."""
         result = GuacamoleProtocol.format_instruction(["size", 800, 600])
-        assert result == "4.size,3.800,3.600;"
+        assert result == b"4.size,3.800,3.600;"
 
     def test_parse_instruction_basic(self):
         """Test parse_instruction with basic input."""
@@ -123,6 +123,7 @@ class TestGuacdClient:
         reader = AsyncMock()
         writer = AsyncMock()
         writer.write = MagicMock()
+        writer.writelines = MagicMock()
         writer.drain = AsyncMock()
         writer.close = MagicMock()
         writer.wait_closed = AsyncMock()
@@ -143,9 +144,11 @@ class TestGuacdClient:
         # Remove the _activity_check_task assertion since it was removed
         assert hasattr(guacd_client, "logger")
         assert hasattr(guacd_client, "last_activity")
-        # Test filter initialization
-        assert len(guacd_client.filters) == 1
-        assert guacd_client.filters[0].__class__.__name__ == "ErrorFilter"
+        # Test filter initialization: ErrorFilter registered for "error" only
+        assert list(guacd_client.filters_by_opcode) == ["error"]
+        error_filters = guacd_client.filters_by_opcode["error"]
+        assert len(error_filters) == 1
+        assert error_filters[0].__class__.__name__ == "ErrorFilter"
 
     def test_apply_filters(self, guacd_client):
         """Test _apply_filters method."""
@@ -197,8 +200,10 @@ class TestGuacdClient:
 
         await guacd_client.send_instruction(["select", "rdp"])
 
-        # Check that the correct format was written
-        writer.write.assert_called_once()
+        # Check that the correct fragments were written
+        writer.writelines.assert_called_once()
+        fragments = writer.writelines.call_args[0][0]
+        assert b"".join(fragments) == b"6.select,3.rdp;"
         writer.drain.assert_called_once()
 
     @pytest.mark.asyncio
@@ -258,8 +263,8 @@ class TestGuacdClient:
         reader, _ = mock_reader_writer
         guacd_client.reader = reader
 
-        # Mock reader.read to return a complete instruction
-        reader.read.return_value = b"4.size,3.800,3.600;"
+        # Mock reader.readuntil to return a complete instruction
+        reader.readuntil.return_value = b"4.size,3.800,3.600;"
 
         result = await guacd_client._receive_instruction()
         assert result == ["size", "800", "600"]
@@ -268,6 +273,7 @@ class TestGuacdClient:
     async def test_start_handshake_success(self, guacd_client):
         """Test _start_handshake success path."""
         guacd_client.send_instruction = AsyncMock()
+        guacd_client.send_instructions = AsyncMock()
         guacd_client._receive_instruction = AsyncMock(
             return_value=["args", "1.0", "width", "height"]
         )
@@ -282,6 +288,8 @@ class TestGuacdClient:
 
         # Verify protocol selection was sent
         assert guacd_client.send_instruction.call_count >= 1
+        # The post-args instructions go out as one batch
+        guacd_client.send_instructions.assert_called_once()
         # Verify state is now OPEN
         assert guacd_client.state == GuacdClient.STATE_OPEN
 
@@ -374,9 +382,8 @@ class TestGuacdClientAdvanced:
     async def test_receive_instruction_connection_closed(self, guacd_client):
         """Test _receive_instruction when connection closed by server."""
         mock_reader = AsyncMock()
-        mock_reader.read.return_value = (
-            b""  # Empty response indicates closed connection
-        )
+        # EOF before a separator surfaces as IncompleteReadError
+        mock_reader.readuntil.side_effect = asyncio.IncompleteReadError(b"", None)
         guacd_client.reader = mock_reader
 
         result = await guacd_client._receive_instruction()
@@ -386,20 +393,22 @@ class TestGuacdClientAdvanced:
     async def test_receive_instruction_chunked_data(self, guacd_client):
         """Test _receive_instruction with chunked data."""
         mock_reader = AsyncMock()
-        # Simulate receiving data in chunks
-        mock_reader.read.side_effect = [
-            b"4.size,3.",  # First chunk
-            b"800,3.600;",  # Second chunk
+        # A ';' inside an element value makes readuntil stop mid-instruction,
+        # so the data arrives across two calls
+        mock_reader.readuntil.side_effect = [
+            b"4.size,4.80;",  # First chunk (separator inside a value)
+            b"0,3.600;",  # Second chunk completes the instruction
         ]
         guacd_client.reader = mock_reader
 
         result = await guacd_client._receive_instruction()
-        assert result == ["size", "800", "600"]
+        assert result == ["size", "80;0", "600"]
 
     @pytest.mark.asyncio
     async def test_start_handshake_error_response(self, guacd_client):
         """Test _start_handshake when guacd returns error during ready phase."""
         guacd_client.send_instruction = AsyncMock()
+        guacd_client.send_instructions = AsyncMock()
 
         # Mock the sequence: args instruction, then error instruction with status code
         guacd_client._receive_instruction = AsyncMock(
@@ -423,6 +432,7 @@ class TestGuacdClientAdvanced:
     async def test_start_handshake_error_no_message(self, guacd_client):
         """Test _start_handshake when guacd returns error without message."""
         guacd_client.send_instruction = AsyncMock()
+        guacd_client.send_instructions = AsyncMock()
 
         # Mock the sequence: args instruction, then error instruction without message but with status code
         guacd_client._receive_instruction = AsyncMock(
@@ -446,6 +456,7 @@ class TestGuacdClientAdvanced:
     async def test_start_handshake_no_ready_instruction(self, guacd_client):
         """Test _start_handshake when no ready instruction received."""
         guacd_client.send_instruction = AsyncMock()
+        guacd_client.send_instructions = AsyncMock()
 
         # Mock the sequence: args instruction, then empty response
         guacd_client._receive_instruction = AsyncMock(
@@ -466,6 +477,7 @@ class TestGuacdClientAdvanced:
     async def test_start_handshake_wrong_ready_instruction(self, guacd_client):
         """Test _start_handshake when wrong instruction received instead of ready."""
         guacd_client.send_instruction = AsyncMock()
+        guacd_client.send_instructions = AsyncMock()
 
         # Mock the sequence: args instruction, then wrong instruction
         guacd_client._receive_instruction = AsyncMock(
@@ -486,6 +498,7 @@ class TestGuacdClientAdvanced:
     async def test_start_handshake_boolean_and_none_parameters(self, guacd_client):
         """Test _start_handshake with boolean and None parameters."""
         guacd_client.send_instruction = AsyncMock()
+        guacd_client.send_instructions = AsyncMock()
 
         # Mock the sequence for successful handshake
         guacd_client._receive_instruction = AsyncMock(
@@ -497,13 +510,13 @@ class TestGuacdClientAdvanced:
 
         await guacd_client._start_handshake()
 
-        # Verify that send_instruction was called with properly
-        # formatted boolean/None values
-        calls = guacd_client.send_instruction.call_args_list
+        # Verify that the batched send included a connect instruction with
+        # properly formatted boolean/None values
+        (batch,) = guacd_client.send_instructions.call_args[0]
         connect_call = None
-        for call in calls:
-            if call[0][0][0] == "connect":
-                connect_call = call[0][0]
+        for parts in batch:
+            if parts[0] == "connect":
+                connect_call = parts
                 break
 
         assert connect_call is not None